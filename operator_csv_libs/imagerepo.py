@@ -1,6 +1,10 @@
 from .images import Image
 from artifactory import ArtifactoryPath
+from concurrent.futures import ThreadPoolExecutor
+import logging
 import os, sys, json
+import time
+import hashlib
 import requests
 
 class ImageRepo:
@@ -9,25 +13,29 @@ class ImageRepo:
     """
     def __init__(self, image, logger=None):
         self.image = image
+        self.log = logger if logger else logging.getLogger(__name__)
+        # Grab the repo once instead of re-querying it for every check below
+        repo = self.image.get_image_repo()
 
         # Check for some well known repos
-        if 'artifactory' in self.image.get_image_repo():
+        if 'artifactory' in repo:
             self.image_repo = ArtifactoryRepo(self.image)
-        elif self.image.get_image_repo().startswith('quay.io/'):
+        elif repo.startswith('quay.io/'):
             self.image_repo = QuayRepo(self.image)
-        elif self.image.get_image_repo().startswith('docker.io'):
+        elif repo.startswith('docker.io'):
             self.image_repo = DockerRepo(self.image)
 
         else:
             raise RepoTypeNotImplemented('Unknown repository type for image {}'.format(image.get_image()))
+        self.log.debug('Identified %s as a %s image', image.get_image(), type(self.image_repo).__name__)
 
-    def get_manifest_list_digest(self):
-        return self.image_repo.get_manifest_list_digest()
+    def get_manifest_list_digest(self, refresh=False):
+        return self.image_repo.get_manifest_list_digest(refresh=refresh)
 
-    def get_image_digest(self):
-        return self.image_repo.get_image_digest()
+    def get_image_digest(self, refresh=False):
+        return self.image_repo.get_image_digest(refresh=refresh)
 
-    def get_raw_manifest_list(self):
+    def get_raw_manifest_list(self, refresh=False):
         """Return the docker manifest list in json format
 
         :raises ManifestListNotFound: description
@@ -35,7 +43,36 @@ class ImageRepo:
         :return: manifest.list.json content
         :rtype: dict
         """
-        return self.image_repo.get_raw_manifest_list()
+        return self.image_repo.get_raw_manifest_list(refresh=refresh)
+
+    def get_manifest_list_with_digest(self, refresh=False):
+        """Return the docker manifest list and its digest in one round-trip
+
+        :raises ManifestListNotFound: description
+
+        :return: manifest.list.json content and digest in format sha256:<hash>
+        :rtype: (dict, string)
+        """
+        return self.image_repo.get_manifest_list_with_digest(refresh=refresh)
+
+def resolve_many(images, max_workers=32):
+    """Resolve image digests for several images concurrently.
+
+    Each lookup blocks on the network, so fanning them out over a thread pool
+    gives close to an N-way speedup regardless of which registry hosts each image.
+
+    :param images: List of Image objects
+    :type images: list
+
+    :return: Image digests in the same order as the supplied images
+    :rtype: list
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda i: ImageRepo(i).get_image_digest(), images))
+
+def _cache_key(image):
+    # Identity of the query target, shared by all the per-registry caches
+    return (image.get_image_repo(), image.get_image_name(), image.get_tag())
 
 class ArtifactoryRepo:
     # Allow credentials to be shared between instances
@@ -43,91 +80,119 @@ class ArtifactoryRepo:
     _artifactory_key = None
     _artifactory_base = None
 
+    # Previous query results shared between instances, so repeated lookups for
+    # the same (repo, name, tag) during one pass skip the network entirely
+    _digest_cache = {}
+    _list_digest_cache = {}
+    _manifest_list_cache = {}
+
+    # Shared across instances so keep-alive connections to the artifactory server are reused
+    _session = None
+
     def __init__(self, image, artifactory_base=None, artifactory_user=None, artifactory_key=None, logger=None):
         self.image = image
+        self.log = logger if logger else logging.getLogger(__name__)
 
         # Always give provided credential preference
-        if artifactory_user:
-            self.artifactory_user = artifactory_user
-        elif self._artifactory_user:
-            self.artifactory_user = self._artifactory_user
-        elif 'ARTIFACTORY_USER' in os.environ:
-            # Go to environment variables if we don't have them as class variable either
-            self._artifactory_user = os.getenv('ARTIFACTORY_USER')
-            self.artifactory_user = self._artifactory_user
-        else:
-            # This is where we should panic and throw some orderly exception
+        self.artifactory_user, self.artifactory_key, self.artifactory_base = self._resolve_credentials(
+            artifactory_user, artifactory_key, artifactory_base)
+
+        # For artifactory we need to massage the repo string a bit. It never
+        # changes for an instance, so split it exactly once here
+        ### Split out the first part of repo.artifactory.com and all directories after it
+        r, _, p = image.get_image_repo().partition('/')
+        self._repo_segment = '{}/{}'.format(r.split('.', 1)[0], p)
+
+        # ArtifactoryPath objects we've already built, keyed by URL
+        self._path_cache = {}
+
+    @classmethod
+    def _resolve_credentials(cls, user, key, base):
+        # Resolve the credential triple once: explicit arguments win, then values
+        # cached at class scope, then the environment. Environment lookups only
+        # happen until all three are cached, so repeat construction is cheap.
+        if not (cls._artifactory_user and cls._artifactory_key and cls._artifactory_base):
+            cls._artifactory_user = cls._artifactory_user or os.environ.get('ARTIFACTORY_USER')
+            cls._artifactory_key = cls._artifactory_key or os.environ.get('ARTIFACTORY_KEY')
+            cls._artifactory_base = cls._artifactory_base or os.environ.get('ARTIFACTORY_BASE')
+
+        user = user or cls._artifactory_user
+        key = key or cls._artifactory_key
+        base = base or cls._artifactory_base
+
+        # This is where we should panic and throw some orderly exception
+        if not user:
             raise MissingCredentials("No artifactory user provided or found in ARTIFACTORY_USER environment variable")
-
-        if artifactory_key:
-            self.artifactory_key = artifactory_key
-        elif self._artifactory_key:
-            self.artifactory_key = self._artifactory_key
-        elif 'ARTIFACTORY_KEY' in os.environ:
-            self._artifactory_key = os.getenv('ARTIFACTORY_KEY')
-            self.artifactory_key = self._artifactory_key
-        else:
-            # This is where we should panic and throw some orderly exception
+        if not key:
             raise MissingCredentials("No artifactory key provided or found in ARTIFACTORY_KEY environment variable")
-
-        if artifactory_base:
-            self.artifactory_base = artifactory_base
-        elif self._artifactory_base:
-            self.artifactory_base = self._artifactory_base
-        elif 'ARTIFACTORY_BASE' in os.environ:
-            self._artifactory_base = os.getenv('ARTIFACTORY_BASE')
-            self.artifactory_base = self._artifactory_base
-        else:
-            # This is where we should panic and throw some orderly exception
+        if not base:
             raise MissingCredentials("No artifactory base provided or found in ARTIFACTORY_BASE environment variable")
-
-    def get_image_digest(self):
+        return user, key, base
+
+    @classmethod
+    def _get_session(cls):
+        # Lazily create a single session so all ArtifactoryPath objects reuse connections
+        if cls._session is None:
+            cls._session = requests.Session()
+        return cls._session
+
+    def get_image_digest(self, refresh=False):
+        key = _cache_key(self.image)
+        if refresh or key not in ArtifactoryRepo._digest_cache:
+            ArtifactoryRepo._digest_cache[key] = self._get_raw_image_digest()
         # We know we're always querying for sha256
-        return 'sha256:{}'.format(self._get_raw_image_digest())
+        return 'sha256:{}'.format(ArtifactoryRepo._digest_cache[key])
 
     def _get_artifactory_repo(self):
-        # For artifactory we need to massage the repo string a bit
-        ### Split out all directories after artifactory.com/
-        p = '/'.join(self.image.get_image_repo().split('/')[1:])
-        ### Split out the first part of repo.artifactory.com
-        r = self.image.get_image_repo().split('.')[0]
-        return '{}/{}'.format(r, p)
+        # The massaged repo is precomputed in __init__ so digest calls don't re-split the string
+        return self._repo_segment
 
-    def _get_raw_image_digest(self):
-        manifestpath = '/'.join([
+    def _manifest_url(self, filename):
+        # All queries target the same <base>/<repo>/<name>/<tag> prefix, only the filename differs
+        return '/'.join([
                         self.artifactory_base,
-                        self._get_artifactory_repo(), # We have to massage the repo for artifactory
+                        self._repo_segment, # We have to massage the repo for artifactory
                         self.image.get_image_name(),
                         self.image.get_tag(),
-                        "manifest.json"
+                        filename
                     ])
-        manifest_path = ArtifactoryPath(manifestpath, auth=(self.artifactory_user, self.artifactory_key))
 
+    def _manifest_path(self, filename):
+        # Constructing an ArtifactoryPath isn't free, so hold on to the ones we've resolved
+        url = self._manifest_url(filename)
+        if url not in self._path_cache:
+            self._path_cache[url] = ArtifactoryPath(url, auth=(self.artifactory_user, self.artifactory_key), session=self._get_session())
+        return self._path_cache[url]
+
+    def _head_sha256(self, filename, not_found):
+        # A plain HEAD returns X-Checksum-Sha256 without transferring the body
+        resp = self._get_session().head(self._manifest_url(filename), auth=(self.artifactory_user, self.artifactory_key))
+        if resp.status_code == 404:
+            raise not_found('{} not found for {}'.format(filename, self.image.get_image()))
+        sha256 = resp.headers.get('X-Checksum-Sha256')
+        if sha256:
+            return sha256
+
+        # Header was absent - fall back to the full stat() query
         try:
-            return ArtifactoryPath.stat(manifest_path).sha256
+            return ArtifactoryPath.stat(self._manifest_path(filename)).sha256
         except FileNotFoundError as e:
-            raise ManifestNotFound(e)
+            raise not_found(e)
+
+    def _get_raw_image_digest(self):
+        return self._head_sha256("manifest.json", ManifestNotFound)
 
-    def get_manifest_list_digest(self):
+    def get_manifest_list_digest(self, refresh=False):
+        key = _cache_key(self.image)
+        if refresh or key not in ArtifactoryRepo._list_digest_cache:
+            ArtifactoryRepo._list_digest_cache[key] = self._get_raw_manifest_list_digest()
         # We know we're always querying for sha256
-        return 'sha256:{}'.format(self._get_raw_manifest_list_digest())
+        return 'sha256:{}'.format(ArtifactoryRepo._list_digest_cache[key])
 
     def _get_raw_manifest_list_digest(self):
-        listpath = '/'.join([
-                        self.artifactory_base,
-                        self._get_artifactory_repo(), # We have to massage the repo for artifactory
-                        self.image.get_image_name(),
-                        self.image.get_tag(),
-                        "list.manifest.json"
-                    ])
-        list_path = ArtifactoryPath(listpath, auth=(self.artifactory_user, self.artifactory_key))
+        return self._head_sha256("list.manifest.json", ManifestListNotFound)
 
-        try:
-            return ArtifactoryPath.stat(list_path).sha256
-        except FileNotFoundError as e:
-            raise ManifestListNotFound(e)
-
-    def get_raw_manifest_list(self):
+    def get_raw_manifest_list(self, refresh=False):
         """Return the docker manifest list in json format
 
         :raises ManifestListNotFound: description
@@ -135,15 +200,11 @@ class ArtifactoryRepo:
         :return: manifest.list.json content
         :rtype: dict
         """
+        key = _cache_key(self.image)
+        if not refresh and key in ArtifactoryRepo._manifest_list_cache:
+            return ArtifactoryRepo._manifest_list_cache[key]
 
-        listpath = '/'.join([
-                        self.artifactory_base,
-                        self._get_artifactory_repo(), # We have to massage the repo for artifactory
-                        self.image.get_image_name(),
-                        self.image.get_tag(),
-                        "list.manifest.json"
-                    ])
-        list_path = ArtifactoryPath(listpath, auth=(self.artifactory_user, self.artifactory_key))
+        list_path = self._manifest_path("list.manifest.json")
 
         try:
             f = list_path.open()
@@ -151,46 +212,126 @@ class ArtifactoryRepo:
             raise ManifestListNotFound(e)
         except RuntimeError as e:
             raise ManifestListNotFound(e)
-        return json.loads(f.read().decode('utf-8'))
+        # json.loads parses bytes directly - no need for an intermediate decoded copy
+        ArtifactoryRepo._manifest_list_cache[key] = json.loads(f.read())
+        return ArtifactoryRepo._manifest_list_cache[key]
+
+    def get_manifest_list_with_digest(self, refresh=False):
+        """Return the docker manifest list and its digest in one round-trip
+
+        Callers that need both previously paid two requests (one stat() and one
+        open()); hashing the body we already downloaded is free by comparison.
+
+        :raises ManifestListNotFound: description
+
+        :return: manifest.list.json content and digest in format sha256:<hash>
+        :rtype: (dict, string)
+        """
+        key = _cache_key(self.image)
+        if refresh or key not in ArtifactoryRepo._manifest_list_cache or key not in ArtifactoryRepo._list_digest_cache:
+            list_path = self._manifest_path("list.manifest.json")
+
+            try:
+                f = list_path.open()
+            except FileNotFoundError as e:
+                raise ManifestListNotFound(e)
+            except RuntimeError as e:
+                raise ManifestListNotFound(e)
+            body = f.read()
+            ArtifactoryRepo._manifest_list_cache[key] = json.loads(body)
+            ArtifactoryRepo._list_digest_cache[key] = hashlib.sha256(body).hexdigest()
+        return (ArtifactoryRepo._manifest_list_cache[key], 'sha256:{}'.format(ArtifactoryRepo._list_digest_cache[key]))
 
 class QuayRepo:
     QUAY_BASE_URL = 'https://quay.io/api/v1/repository'
 
+    # Shared across instances so keep-alive connections to quay.io are reused
+    _session = None
+
+    # Previous query results shared between instances
+    _digest_cache = {}
+
+    # ETags and payloads from previous responses, keyed by URL, so refreshed
+    # queries can revalidate with If-None-Match instead of re-downloading
+    _etag_cache = {}
+
     def __init__(self, image):
         self.image = image
 
-    def get_image_digest(self):
-        return self._get_digest(manifest_list=False)
+    @classmethod
+    def get_digests_bulk(cls, images, manifest_list=True, max_workers=32):
+        """Resolve digests for several quay.io images concurrently.
+
+        Each lookup is latency-bound, so fanning them out over a thread pool
+        backed by the shared session gives close to an N-way speedup for bulk scans.
+
+        :param images: List of Image objects hosted on quay.io
+        :type images: list
+
+        :param manifest_list: Query for manifest list digests rather than image digests (default: {True})
+        :type manifest_list: bool
+
+        :return: Digests in the same order as the supplied images
+        :rtype: list
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda i: cls(i)._get_digest(manifest_list=manifest_list), images))
 
-    def get_manifest_list_digest(self):
-        return self._get_digest(manifest_list=True)
+    @classmethod
+    def _get_session(cls):
+        # Lazily create a single session so repeated digest queries reuse connections
+        if cls._session is None:
+            cls._session = requests.Session()
+            cls._session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=100))
+        return cls._session
+
+    def get_image_digest(self, refresh=False):
+        return self._get_digest(manifest_list=False, refresh=refresh)
+
+    def get_manifest_list_digest(self, refresh=False):
+        return self._get_digest(manifest_list=True, refresh=refresh)
+
+    def _get_digest(self, manifest_list, refresh=False):
+        key = _cache_key(self.image) + (manifest_list,)
+        if not refresh and key in QuayRepo._digest_cache:
+            return QuayRepo._digest_cache[key]
 
-    def _get_digest(self, manifest_list):
         url = '/'.join([
                         self.QUAY_BASE_URL,
                         self._get_quay_repo(),
                         'tag',
                         '?onlyActiveTags=true&specificTag='
-                ])
+                ]) + self.image.get_tag()
 
-        resp = requests.get(url + self.image.get_tag())
+        # Revalidate with If-None-Match when we've seen this URL before - a 304 carries no body
+        cached_etag, cached_tags = QuayRepo._etag_cache.get(url, (None, None))
+        headers = {'If-None-Match': cached_etag} if cached_etag else {}
 
-        if resp.status_code == 403:
-            raise MissingCredentials(resp.text)
-        elif resp.status_code == 404:
-            if manifest_list:
-                raise ManifestListNotFound(resp.text)
-            else:
-                raise ManifestNotFound(resp.text)
-        elif not resp.status_code == 200:
-            raise Exception(resp.text)
+        resp = self._get_session().get(url, headers=headers)
+
+        if resp.status_code == 304:
+            tags = cached_tags
+        else:
+            if resp.status_code == 403:
+                raise MissingCredentials(resp.text)
+            elif resp.status_code == 404:
+                if manifest_list:
+                    raise ManifestListNotFound(resp.text)
+                else:
+                    raise ManifestNotFound(resp.text)
+            elif not resp.status_code == 200:
+                raise Exception(resp.text)
+
+            # Since we query for specific tag we expect single response
+            tags = resp.json()['tags']
+            if 'ETag' in resp.headers:
+                QuayRepo._etag_cache[url] = (resp.headers['ETag'], tags)
 
-        # Since we query for specific tag we expect single response
-        tags = resp.json()['tags']
         if len(tags) > 1:
             raise Exception('Expected 1 tag, found {}. {}'.format(len(tags), tags))
         for t in tags:
             if t['is_manifest_list'] == manifest_list:
+                QuayRepo._digest_cache[key] = t['manifest_digest']
                 return t['manifest_digest']
             else:
                 if manifest_list:
@@ -207,19 +348,57 @@ class DockerRepo:
         as well as get the raw manifest list in json format.
     """
 
+    # Shared across instances so keep-alive connections to Docker Hub are reused
+    _session = None
+
+    # Previous query results shared between instances
+    _digest_cache = {}
+    _manifest_list_cache = {}
+
+    # ETags and payloads from previous responses, keyed by URL, so refreshed
+    # queries can revalidate with If-None-Match instead of re-downloading
+    _etag_cache = {}
+
+    # Bearer tokens keyed by org/repo, reused until shortly before they expire
+    _token_cache = {}
+
     def __init__(self,image):
         self.image = image
         self.org = image.get_image().split('/')[1]
         self.repo = image.get_image_name()
         self.tag = image.get_tag()
 
-    def get_image_digest(self):
-        return self._get_digest(manifest_list=False)
-
-    def get_manifest_list_digest(self):
-        return self._get_digest(manifest_list=True)
-
-    def get_raw_manifest_list(self):
+    @classmethod
+    def _get_session(cls):
+        # Lazily create a single session so repeated digest queries reuse connections
+        if cls._session is None:
+            cls._session = requests.Session()
+            cls._session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=100))
+        return cls._session
+
+    def _get_token(self):
+        # Reuse a cached bearer token for this repo until it's about to expire,
+        # saving the round-trip to auth.docker.io on every call
+        scope = '{}/{}'.format(self.org, self.repo)
+        token, expiry = DockerRepo._token_cache.get(scope, (None, 0))
+        if token and time.monotonic() < expiry - 30:
+            return token
+
+        t=self._get_session().get('https://auth.docker.io/token?scope=repository%3A{org}%2F{repo}%3Apull&service=registry.docker.io'.format(org=self.org, repo=self.repo))
+        if not t.status_code == 200:
+            raise MissingCredentials(t.text)
+        body = t.json()
+        # Docker Hub tokens default to a 300s lifetime
+        DockerRepo._token_cache[scope] = (body['token'], time.monotonic() + body.get('expires_in', 300))
+        return body['token']
+
+    def get_image_digest(self, refresh=False):
+        return self._get_digest(manifest_list=False, refresh=refresh)
+
+    def get_manifest_list_digest(self, refresh=False):
+        return self._get_digest(manifest_list=True, refresh=refresh)
+
+    def get_raw_manifest_list(self, refresh=False):
         """ Return the docker manifest list in json format
         
         :raises ManifestListNotFound: No manifest list exists for the specified image.
@@ -227,20 +406,41 @@ class DockerRepo:
         :returns: manifest.list.json content
         :rtype: dict
         """
+        key = _cache_key(self.image)
+        if not refresh and key in DockerRepo._manifest_list_cache:
+            return DockerRepo._manifest_list_cache[key]
+
         ## Get token
-        t=requests.get('https://auth.docker.io/token?scope=repository%3A{org}%2F{repo}%3Apull&service=registry.docker.io'.format(org=self.org, repo=self.repo))
-        token=t.json()['token']
+        token=self._get_token()
 
         ## check media type
+        url='https://registry-1.docker.io/v2/{org}/{repo}/manifests/{tag}'.format(org=self.org,repo=self.repo,tag=self.tag)
         headers={'accept':'application/vnd.docker.distribution.manifest.list.v2+json', 'Authorization': 'Bearer {}'.format(token)}
-        m=requests.get('https://registry-1.docker.io/v2/{org}/{repo}/manifests/{tag}'.format(org=self.org,repo=self.repo,tag=self.tag), headers=headers)
-        
+
+        # Revalidate with If-None-Match when we've seen this URL before - a 304 carries no body
+        cached_etag, cached_body = DockerRepo._etag_cache.get(url, (None, None))
+        if cached_etag:
+            headers['If-None-Match'] = cached_etag
+
+        m=self._get_session().get(url, headers=headers)
+
+        if m.status_code == 304:
+            DockerRepo._manifest_list_cache[key] = cached_body
+            return cached_body
+        elif m.status_code == 404:
+            raise ManifestListNotFound(m.text)
+        elif not m.status_code == 200:
+            raise Exception(m.text)
+
         if 'manifest.list' in m.headers['Content-Type']:
-            return m.json()
+            DockerRepo._manifest_list_cache[key] = m.json()
+            if 'ETag' in m.headers:
+                DockerRepo._etag_cache[url] = (m.headers['ETag'], DockerRepo._manifest_list_cache[key])
+            return DockerRepo._manifest_list_cache[key]
         else:
             raise ManifestListNotFound('No manifest for: ' + self.image.get_image())
 
-    def _get_digest(self, manifest_list):
+    def _get_digest(self, manifest_list, refresh=False):
         """ Return the digest of the docker image or manifest list
 
         :raises ManifestListNotFound: if manifest list is requested but it does not exist
@@ -248,25 +448,37 @@ class DockerRepo:
         :return: docker manifest/manifest list digest
         :rtype: string
         """
+        key = _cache_key(self.image) + (manifest_list,)
+        if not refresh and key in DockerRepo._digest_cache:
+            return DockerRepo._digest_cache[key]
+
         ## Get token
-        t=requests.get('https://auth.docker.io/token?scope=repository%3A{org}%2F{repo}%3Apull&service=registry.docker.io'.format(org=self.org, repo=self.repo))
-        token=t.json()['token']
+        token=self._get_token()
 
-        ## check media type
-        headers={'accept':'application/vnd.docker.distribution.manifest.list.v2+json', 'Authorization': 'Bearer {}'.format(token)}
-        m=requests.get('https://registry-1.docker.io/v2/{org}/{repo}/manifests/{tag}'.format(org=self.org,repo=self.repo,tag=self.tag), headers=headers)
+        ## One HEAD accepting both media types is enough - the registry answers with the
+        ## manifest list when one exists, otherwise with the single arch manifest, and the
+        ## matching digest comes back in Docker-Content-Digest either way
+        headers={'accept':'application/vnd.docker.distribution.manifest.list.v2+json, application/vnd.docker.distribution.manifest.v2+json', 'Authorization': 'Bearer {}'.format(token)}
+        m=self._get_session().head('https://registry-1.docker.io/v2/{org}/{repo}/manifests/{tag}'.format(org=self.org,repo=self.repo,tag=self.tag), headers=headers)
+
+        if m.status_code == 404:
+            if manifest_list:
+                raise ManifestListNotFound(m.text)
+            else:
+                raise ManifestNotFound(m.text)
+        elif not m.status_code == 200:
+            raise Exception(m.text)
 
         if 'manifest.list' in m.headers['Content-Type']:
             if manifest_list:
-                return m.headers['Docker-Content-Digest']
+                DockerRepo._digest_cache[key] = m.headers['Docker-Content-Digest']
+                return DockerRepo._digest_cache[key]
         else:
             if manifest_list:
                 raise ManifestListNotFound("Manifest List does not exist")
             else:
-                ## Get the proper digest for single arch image - need the correct header
-                headers={'accept':'application/vnd.docker.distribution.manifest.v2+json', 'Authorization': 'Bearer {}'.format(token)}
-                m=requests.get('https://registry-1.docker.io/v2/{org}/{repo}/manifests/{tag}'.format(org=self.org,repo=self.repo,tag=self.tag), headers=headers)
-                return m.headers['Docker-Content-Digest']
+                DockerRepo._digest_cache[key] = m.headers['Docker-Content-Digest']
+                return DockerRepo._digest_cache[key]
 
 class MissingCredentials(Exception):
     pass
@@ -1,8 +1,9 @@
 import unittest
+import hashlib
 import os
 
 from unittest.mock import patch
-from ..imagerepo import ImageRepo, ArtifactoryRepo, QuayRepo, DockerRepo
+from ..imagerepo import ImageRepo, ArtifactoryRepo, QuayRepo, DockerRepo, resolve_many
 from ..images import Image
 
 IMG_NAME = 'dummyImageName'
@@ -71,6 +72,14 @@ class TestImageRepo(unittest.TestCase):
         # check to see that digest is returned
         self.assertEqual(self.artifactoryImgRepoWithOsAuthentication.get_image_digest(), 'sha256:dummy_sha')
 
+    @patch.object(ArtifactoryRepo, '_get_raw_image_digest')
+    def test_resolve_many(self, mock_ArtifactoryRepo):
+        # mock api call
+        mock_ArtifactoryRepo.return_value = 'dummy_sha'
+
+        # check to see that a digest is returned for every image
+        self.assertEqual(resolve_many([self.artifactoryImgWithDigest, self.artifactoryImgWithDigest]), ['sha256:dummy_sha', 'sha256:dummy_sha'])
+
 class TestImageRepoQuayImage(unittest.TestCase):
     def setUp(self):
         self.quayImgWithDigest = Image(IMG_NAME, QUAY_IMAGE_WITH_DIGEST, DEPLOYMENT, CONTAINER)
@@ -135,6 +144,16 @@ class TestArtifactoryRepo(unittest.TestCase):
         # should not be tested because then we would need to test API call
         self.assertEqual(True, True)
 
+    @patch.object(ArtifactoryRepo, '_manifest_path')
+    def test_get_manifest_list_with_digest(self, mock_ArtifactoryRepo):
+        # mock the artifactory path so open() returns a known body
+        mock_ArtifactoryRepo.return_value.open.return_value.read.return_value = b'{"dummy": "manifest"}'
+
+        # check that both the parsed body and the locally computed digest are returned
+        manifest_list, digest = self.artifactoryImgRepoWithOsAuthentication.get_manifest_list_with_digest(refresh=True)
+        self.assertEqual(manifest_list, {'dummy': 'manifest'})
+        self.assertEqual(digest, 'sha256:{}'.format(hashlib.sha256(b'{"dummy": "manifest"}').hexdigest()))
+
 
 class TestQuayRepo(unittest.TestCase):
     def setUp(self):
@@ -166,6 +185,14 @@ class TestQuayRepo(unittest.TestCase):
          # should not be tested because then we would need to test API call
         self.assertEqual(True, True)
 
+    @patch.object(QuayRepo, '_get_digest')
+    def test_get_digests_bulk(self, mock_QuayRepo):
+        # mock api call
+        mock_QuayRepo.return_value = 'sha256:dummy_sha'
+
+        # check to see that a digest is returned for every image
+        self.assertEqual(QuayRepo.get_digests_bulk([self.quayImgWithDigest, self.quayImgWithDigest]), ['sha256:dummy_sha', 'sha256:dummy_sha'])
+
     def test__get_quay_repo(self):
         self.assertEqual(self.quayImgRepo._get_quay_repo(), QUAY_REPO)
 